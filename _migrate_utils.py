@@ -0,0 +1,62 @@
+# Shared load/dump helpers for the migration scripts.
+
+
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+import orjson
+
+
+def load_def_with_bytes(path: Path) -> tuple[Any, bytes]:
+    """Parse one definition file, also returning its raw bytes.
+
+    The bytes let the caller compare its eventual output against the input
+    (see dump_def_if_changed) without a second read.
+    """
+    data = path.read_bytes()
+    return orjson.loads(data), data
+
+
+def dump_def_if_changed(path: Path, definition: Any, original: bytes) -> bool:
+    """Write one definition file, formatted the way the definitions repo
+    expects (2-space indent), unless the output would be byte-identical to
+    original (e.g. an idempotent re-run). Returns whether the file was
+    written.
+
+    The write goes to a sibling temp file and is renamed over the target, so
+    a crash mid-write never leaves a truncated definition behind. Any stray
+    non-JSON scalars (e.g. Decimal) are coerced to float by the C-level
+    default hook rather than a per-value Python callback.
+    """
+    data = _dumps_def(definition)
+    if data == original:
+        return False
+    _atomic_write(path, data)
+    return True
+
+
+def _dumps_def(definition: Any) -> bytes:
+    return orjson.dumps(definition, default=float, option=orjson.OPT_INDENT_2)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def fsync_parent_dirs(paths: Iterable[Path]) -> None:
+    """Flush the directory metadata for the given files' parents.
+
+    dump_def_if_changed renames files into place without fsyncing each one;
+    calling this
+    once at the end of a run makes those renames durable with one fsync per
+    distinct directory instead of one per file.
+    """
+    for parent in {Path(path).parent for path in paths}:
+        dir_fd = os.open(parent, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
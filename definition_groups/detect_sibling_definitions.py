@@ -17,7 +17,10 @@ import json
 import re
 import sys
 
-PARENT_SIGNIFIERS = {"aluminumblock", "tuberack", "adapter"}
+# frozensets of interned strings so the membership tests in get_group_id can
+# hit CPython's pointer-equality fast path.
+PARENT_SIGNIFIERS = frozenset(map(sys.intern, ("aluminumblock", "tuberack", "adapter")))
+THROWAWAY_PARTS = frozenset(map(sys.intern, ("flat", "full", "skirt", "pcr")))
 
 
 def get_group_id(load_name: str) -> str:
@@ -25,41 +28,38 @@ def get_group_id(load_name: str) -> str:
 
     This tries to throw away info about the parent while retaining info about the child.
     """
-    parts = load_name.split("_")
+    kept_parts: list[str] = []
+    parent_signifier_seen = False
+    for part in load_name.split("_"):
+        # Throw away parts that are just integers, e.g. the "96" in "opentrons_96_flat_bottom_adapter".
+        # They are problematic to deal with because they get deduplicated. For example, in
+        # "opentrons_96_flat_bottom_adapter_nest_wellplate_200ul_flat", it
+        # is "nest_wellplate", not "nest_96_wellplate", even though the plate's standalone
+        # definition has "nest_96_wellplate".
+        #
+        # Also throw away certain keywords. e.g. "opentrons_96_aluminumblock_nest_wellplate_100ul"
+        # should be in the same group as "opentrons_96_pcr_adapter_nest_wellplate_100ul_pcr_full_skirt".
+        if part.isnumeric() or part in THROWAWAY_PARTS:
+            continue
 
-    # Throw away parts that are just integers, e.g. the "96" in "opentrons_96_flat_bottom_adapter".
-    # They are problematic to deal with because they get deduplicated. For example, in
-    # "opentrons_96_flat_bottom_adapter_nest_wellplate_200ul_flat", it
-    # is "nest_wellplate", not "nest_96_wellplate", even though the plate's standalone
-    # definition has "nest_96_wellplate".
-    #
-    # Also throw away certain keywords. e.g. "opentrons_96_aluminumblock_nest_wellplate_100ul"
-    # should be in the same group as "opentrons_96_pcr_adapter_nest_wellplate_100ul_pcr_full_skirt".
-    parts = [
-        part
-        for part in parts
-        if not (part.isnumeric() or part in {"flat", "full", "skirt", "pcr"})
-    ]
+        # Everything to the left of the first parent signifier is part of the
+        # parent and everything to the right is part of the child.
+        if not parent_signifier_seen and part in PARENT_SIGNIFIERS:
+            parent_signifier_seen = True
+            kept_parts.clear()
+            continue
 
-    # Everything to the left of the parent signifier is part of the parent
-    # and everything to the right is part of the child.
-    try:
-        parent_signifier_index = next(
-            index for index, part in enumerate(parts) if part in PARENT_SIGNIFIERS
-        )
-    except StopIteration:
-        pass
-    else:
-        parts = parts[parent_signifier_index + 1 :]
+        kept_parts.append(part)
 
-    return "_".join(parts)
+    return "_".join(kept_parts)
 
 
 if __name__ == "__main__":
     groups = defaultdict[str, set[str]](set)
-    load_names = [line.strip() for line in sys.stdin]
-    for load_name in load_names:
-        groups[get_group_id(load_name)].add(load_name)
+    for line in sys.stdin:
+        load_name = line.strip()
+        if load_name:
+            groups[get_group_id(load_name)].add(load_name)
 
     to_print = {
         **{
@@ -1,8 +1,10 @@
-import json
+import hashlib
 from pathlib import Path
 import sys
 from typing import Any
 
+import orjson
+
 
 def get_definition_path(root: Path, load_name: str) -> Path | None:
     matches = list((root / load_name).glob("*.json"))
@@ -11,31 +13,43 @@ def get_definition_path(root: Path, load_name: str) -> Path | None:
     return matches[0] if matches else None
 
 
-def geometries_equal(geometry_a: dict[str, Any], geometry_b: dict[str, Any]) -> bool:
-    if len(geometry_a) == 1 and len(geometry_b) == 1:
-        return next(iter(geometry_a.values())) == next(iter(geometry_b.values()))
-    else:
-        return False  # Not implemented.
+def canonical_hash(geometry: dict[str, Any]) -> bytes:
+    """Hash a definition's innerLabwareGeometry contents, ignoring the
+    geometry IDs it keys them by.
+
+    Sibling definitions store identical geometry under different IDs, so
+    only the values count: each value is hashed via its canonical
+    (key-sorted) JSON serialization, and the sorted value digests are hashed
+    together. Two definitions hash the same exactly when their geometries
+    are structurally equal, whatever IDs they use.
+    """
+    value_digests = sorted(
+        hashlib.blake2b(
+            orjson.dumps(value, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).digest()
+        for value in geometry.values()
+    )
+    return hashlib.blake2b(b"".join(value_digests), digest_size=16).digest()
 
 
 if __name__ == "__main__":
     groups_file = Path(sys.argv[1])
     definitions_path = Path(sys.argv[2])
 
-    groups_dict = json.loads(groups_file.read_bytes())
+    groups_dict = orjson.loads(groups_file.read_bytes())
     for group_name, group_members in groups_dict.items():
         definition_paths = [
             get_definition_path(definitions_path, load_name)
             for load_name in group_members
         ]
-        geometries: list[dict[str, Any]] = [
-            json.loads(path.read_bytes()).get("innerLabwareGeometry", {})
+        geometry_hashes = {
+            canonical_hash(
+                orjson.loads(path.read_bytes()).get("innerLabwareGeometry", {})
+            )
             for path in definition_paths
             if path
-        ]
-        all_geometries_equal = all(
-            geometries_equal(g, geometries[0]) for g in geometries
-        )
+        }
+        all_geometries_equal = len(geometry_hashes) <= 1
         mark = "✅" if all_geometries_equal else "❌"
         print(f'{mark} group "{group_name}"')
         for member, path in zip(group_members, definition_paths):
@@ -1,8 +1,11 @@
 from collections import defaultdict
-import json
+from concurrent.futures import ProcessPoolExecutor
+import os
 from pathlib import Path
 import sys
 
+import orjson
+
 
 def get_dimensions_key(definition):
     dimensions = definition["dimensions"]
@@ -10,30 +13,68 @@ def get_dimensions_key(definition):
 
 
 def get_wells_xy_key(definition):
-    def get_well_xy(well_name):
-        well = definition["wells"][well_name]
-        return well["x"], well["y"]
-
+    # Local alias so the generator does a plain local lookup per well instead
+    # of a closure call plus repeated subscripting of the definition.
+    wells = definition["wells"]
     return tuple(
-        get_well_xy(well_name)
+        (wells[well_name]["x"], wells[well_name]["y"])
         for column in definition["ordering"]
         for well_name in column
     )
 
 
+def find_tube_jsons(root):
+    """Yield the path of every .json file whose parent directory name contains "tube".
+
+    Equivalent to Path.rglob("*tube*/*.json"), but walks with os.scandir so
+    each entry's name and type come from the cached DirEntry instead of a
+    fresh Path object and extra stat() calls.
+    """
+    stack = [(str(root), False)]
+    while stack:
+        dir_path, is_tube_dir = stack.pop()
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, "tube" in entry.name))
+                elif is_tube_dir and entry.name.endswith(".json"):
+                    yield entry.path
+
+
+def load_one(definition_path: str):
+    """Read and parse one definition, returning its comparison keys.
+
+    Runs in a worker process. Returns (path, keys, error), where keys is None
+    and error explains why if the definition was missing an expected key.
+    """
+    definition = orjson.loads(Path(definition_path).read_bytes())
+    try:
+        keys = get_dimensions_key(definition), get_wells_xy_key(definition)
+    except KeyError as e:
+        return definition_path, None, f"missing key {e}"
+    return definition_path, keys, None
+
+
 if __name__ == "__main__":
     search_path = Path(sys.argv[1])
     print(search_path)
-    definition_paths = list(search_path.rglob("*tube*/*.json"))
+    definition_paths = list(find_tube_jsons(search_path))
     print(definition_paths)
 
     dimensions_results = defaultdict(list)
     wells_results = defaultdict(list)
 
-    for definition_path in definition_paths:
-        definition = json.loads(definition_path.read_bytes())
-        dimensions_results[get_dimensions_key(definition)].append(str(definition_path))
-        wells_results[get_wells_xy_key(definition)].append(str(definition_path))
+    # The per-file read+parse work is independent, so fan it out across cores.
+    with ProcessPoolExecutor() as executor:
+        for definition_path, keys, error in executor.map(
+            load_one, definition_paths, chunksize=32
+        ):
+            if keys is None:
+                print(f"Skipping {definition_path}: {error}")
+                continue
+            dimensions_key, wells_xy_key = keys
+            dimensions_results[dimensions_key].append(definition_path)
+            wells_results[wells_xy_key].append(definition_path)
 
     print("DIMENSIONS:")
     for key in dimensions_results:
@@ -10,13 +10,14 @@ Usage:
 
 import csv
 import dataclasses
-import json
+import functools
 import sys
 import typing
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from traceback import format_exception, format_exception_only
 
+import orjson
 import pydantic
 
 
@@ -41,21 +42,21 @@ class DefinitionInfo(pydantic.BaseModel):
     ]
     hw_diameter: typing.Annotated[
         Decimal | str,
-        pydantic.Field(union_mode="left_to_right", alias="hw diameter"),
+        pydantic.Field(alias="hw diameter"),
     ]
     hw_x_size: typing.Annotated[
         Decimal | str,
-        pydantic.Field(union_mode="left_to_right", alias="hw x-size"),
+        pydantic.Field(alias="hw x-size"),
     ]
     hw_y_size: typing.Annotated[
         Decimal | str,
-        pydantic.Field(union_mode="left_to_right", alias="hw y-size"),
+        pydantic.Field(alias="hw y-size"),
     ]
 
     # Labware dimensions:
     hw_length: typing.Annotated[
         Decimal | str,
-        pydantic.Field(union_mode="left_to_right", alias="hw length"),
+        pydantic.Field(alias="hw length"),
     ]
     hw_width: typing.Annotated[
         Decimal,
@@ -77,13 +78,47 @@ class DefinitionInfo(pydantic.BaseModel):
     ]
     hw_x_spacing: typing.Annotated[
         Decimal | str,
-        pydantic.Field(union_mode="left_to_right", alias="hw x-spacing"),
+        pydantic.Field(alias="hw x-spacing"),
     ]
     hw_y_spacing: typing.Annotated[
         Decimal | str,
-        pydantic.Field(union_mode="left_to_right", alias="hw y-spacing"),
+        pydantic.Field(alias="hw y-spacing"),
     ]
 
+    @pydantic.field_validator(
+        "hw_diameter",
+        "hw_x_size",
+        "hw_y_size",
+        "hw_length",
+        "hw_x_spacing",
+        "hw_y_spacing",
+        mode="before",
+    )
+    @classmethod
+    def _maybe_decimal(cls, value: str | Decimal) -> str | Decimal:
+        """Convert numeric cells to Decimal up front.
+
+        Doing the conversion here lets the `Decimal | str` unions match the
+        incoming value by type. With union_mode="left_to_right", pydantic
+        instead tried (and internally raised on) a Decimal parse for every
+        non-numeric cell like "N/A".
+        """
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            return value
+
+
+definition_info_list_adapter = pydantic.TypeAdapter(list[DefinitionInfo])
+
+# The CSV headers to extract, computed once so the hot path is a flat tuple of
+# strings instead of a fresh walk over DefinitionInfo.model_fields.
+DEFINITION_INFO_HEADER_NAMES: tuple[str, ...] = tuple(
+    field.alias
+    for field in DefinitionInfo.model_fields.values()
+    if field.alias is not None
+)
+
 
 @dataclasses.dataclass
 class CSVCoordinate:
@@ -93,19 +128,37 @@ class CSVCoordinate:
     col_index: int
 
 
-def find_csv_header(csv_rows: list[list[str]], header_text: str) -> CSVCoordinate:
-    """Find the location of a header within a CSV file."""
+@functools.lru_cache(maxsize=None)
+def normalize_header(text: str) -> str:
+    return text.lower().replace("\n", " ")
 
-    def normalize_header(text: str) -> str:
-        return text.lower().replace("\n", " ")
 
-    matching_cells = [
-        CSVCoordinate(row_index=row_index, col_index=col_index)
-        for row_index, row in enumerate(csv_rows)
-        for col_index, cell in enumerate(row)
-        if normalize_header(cell) == normalize_header(header_text)
-    ]
+def build_header_index(
+    csv_rows: typing.Iterable[list[str]],
+) -> dict[str, list[CSVCoordinate]]:
+    """Index every cell of the CSV by its normalized text, in a single scan.
+
+    This lets callers look up any number of headers without rescanning the
+    whole sheet once per header.
+    """
+    index: dict[str, list[CSVCoordinate]] = {}
+    for row_index, row in enumerate(csv_rows):
+        for col_index, cell in enumerate(row):
+            if not cell or len(cell) > 64:
+                # Empty or conspicuously long cells can't be headers we care
+                # about. Skip normalizing them.
+                continue
+            index.setdefault(normalize_header(cell), []).append(
+                CSVCoordinate(row_index=row_index, col_index=col_index)
+            )
+    return index
 
+
+def find_csv_header(
+    header_index: dict[str, list[CSVCoordinate]], header_text: str
+) -> CSVCoordinate:
+    """Find the location of a header within a CSV file."""
+    matching_cells = header_index.get(normalize_header(header_text), [])
     if len(matching_cells) != 1:
         raise ValueError(
             f"Expected 1 cell to match {repr(header_text)} but got {len(matching_cells)}."
@@ -114,22 +167,21 @@ def find_csv_header(csv_rows: list[list[str]], header_text: str) -> CSVCoordinat
 
 
 def extract_definition_info_from_csv(
-    csv_rows: list[list[str]],
+    csv_path: Path,
 ) -> list[tuple[int, DefinitionInfo | pydantic.ValidationError]]:
     """Extract info for all labware definitions mentioned in the CSV.
 
+    Streams the file in two passes--one to locate the headers and one to pull
+    out just the cells underneath them--so the full sheet is never held in
+    memory at once.
+
     Returns a list of (row_index, extraction_result) tuples.
     """
-    numbered_rows = list(enumerate(csv_rows))
-
-    header_names = (
-        field.alias
-        for field in DefinitionInfo.model_fields.values()
-        if field.alias is not None
-    )
+    with open(csv_path) as csv_file:
+        header_index = build_header_index(csv.reader(csv_file))
     header_location_by_name = {
-        target_header_name: find_csv_header(csv_rows, target_header_name)
-        for target_header_name in header_names
+        target_header_name: find_csv_header(header_index, target_header_name)
+        for target_header_name in DEFINITION_INFO_HEADER_NAMES
     }
 
     header_row = next(iter(header_location_by_name.values())).row_index
@@ -140,24 +192,62 @@ def extract_definition_info_from_csv(
         )
     ):
         raise ValueError("Headers are not all on the same row.")
-    numbered_rows = numbered_rows[header_row + 1 :]
 
-    result: list[tuple[int, DefinitionInfo | pydantic.ValidationError]] = []
-    for row_index, row in numbered_rows:
-        values_by_header_name = {
-            header_name: row[header_location.col_index]
-            for header_name, header_location in header_location_by_name.items()
+    row_indices: list[int] = []
+    payloads: list[dict[str, str]] = []
+    with open(csv_path) as csv_file:
+        for row_index, row in enumerate(csv.reader(csv_file)):
+            if row_index <= header_row:
+                continue
+            values_by_header_name = {
+                header_name: row[header_location.col_index]
+                for header_name, header_location in header_location_by_name.items()
+            }
+            if not any(values_by_header_name.values()):
+                # Empty row, probably just space at the bottom of the spreadsheet.
+                # Silently drop it.
+                continue
+            row_indices.append(row_index)
+            payloads.append(values_by_header_name)
+
+    return list(zip(row_indices, validate_definition_info_rows(payloads)))
+
+
+def validate_definition_info_rows(
+    payloads: list[dict[str, str]],
+) -> list[DefinitionInfo | pydantic.ValidationError]:
+    """Validate all rows through a single batched TypeAdapter call.
+
+    Batching amortizes pydantic's per-call setup cost across the whole sheet.
+    If the batch fails, only the offending rows are re-validated individually,
+    so the result still carries one ValidationError per bad row.
+    """
+    try:
+        return list(definition_info_list_adapter.validate_python(payloads))
+    except pydantic.ValidationError as batch_error:
+        failed_indices = {
+            error["loc"][0]
+            for error in batch_error.errors()
+            if isinstance(error["loc"][0], int)
         }
-        if not any(values_by_header_name.values()):
-            # Empty row, probably just space at the bottom of the spreadsheet.
-            # Silently drop it.
-            continue
-        try:
-            row_result = DefinitionInfo.model_validate(values_by_header_name)
-        except pydantic.ValidationError as e:
-            row_result = e
-        result.append((row_index, row_result))
-    return result
+
+    good_payloads = [
+        payload
+        for index, payload in enumerate(payloads)
+        if index not in failed_indices
+    ]
+    good_results = iter(definition_info_list_adapter.validate_python(good_payloads))
+
+    results: list[DefinitionInfo | pydantic.ValidationError] = []
+    for index, payload in enumerate(payloads):
+        if index in failed_indices:
+            try:
+                results.append(DefinitionInfo.model_validate(payload))
+            except pydantic.ValidationError as row_error:
+                results.append(row_error)
+        else:
+            results.append(next(good_results))
+    return results
 
 
 def rewrite_definition(
@@ -170,9 +260,36 @@ def rewrite_definition(
             " and this script isn't smart enough to account for that."
         )
 
+    # Everything that doesn't depend on the individual well is resolved up
+    # front, so the per-well loop is just dict assignments and arithmetic.
+    col_count = len(definition["ordering"])
+    if col_count == 1:
+        x_spacing = 0
+    elif isinstance(new_info.hw_x_spacing, Decimal):
+        x_spacing = new_info.hw_x_spacing
+    else:
+        raise ValueError(
+            f"Labware has multiple columns but CSV did not provide valid x spacing: {new_info.hw_x_spacing}"
+        )
+
+    wells = definition["wells"]
+    y_base = new_info.hw_width - new_info.hw_y_offset
+    z = new_info.hw_height - new_info.hw_depth
+
     for col_index, col in enumerate(definition["ordering"]):
+        row_count = len(col)
+        if row_count == 1:
+            y_spacing = 0
+        elif isinstance(new_info.hw_y_spacing, Decimal):
+            y_spacing = new_info.hw_y_spacing
+        else:
+            raise ValueError(
+                f"Labware has multiple rows but CSV did not provide valid y spacing: {new_info.hw_y_spacing}"
+            )
+
+        x = new_info.hw_x_offset + x_spacing * col_index
         for row_index, well_name in enumerate(col):
-            well = definition["wells"][well_name]
+            well = wells[well_name]
 
             well["depth"] = new_info.hw_depth
 
@@ -186,34 +303,18 @@ def rewrite_definition(
                     "Expected well to either have diameter, or xDimension+yDimension."
                 )
 
-            col_count = len(definition["ordering"])
-            row_count = len(col)
-            if col_count == 1:
-                x_spacing = 0
-            elif isinstance(new_info.hw_x_spacing, Decimal):
-                x_spacing = new_info.hw_x_spacing
-            else:
-                raise ValueError(
-                    f"Labware has multiple columns but CSV did not provide valid x spacing: {new_info.hw_x_spacing}"
-                )
-            if row_count == 1:
-                y_spacing = 0
-            elif isinstance(new_info.hw_y_spacing, Decimal):
-                y_spacing = new_info.hw_y_spacing
-            else:
-                raise ValueError(
-                    f"Labware has multiple rows but CSV did not provide valid y spacing: {new_info.hw_y_spacing}"
-                )
-
-            well["x"] = new_info.hw_x_offset + x_spacing * col_index
-            well["y"] = new_info.hw_width - new_info.hw_y_offset - y_spacing * row_index
-            well["z"] = new_info.hw_height - new_info.hw_depth
+            well["x"] = x
+            well["y"] = y_base - y_spacing * row_index
+            well["z"] = z
 
     definition["dimensions"]["xDimension"] = new_info.hw_length
     definition["dimensions"]["yDimension"] = new_info.hw_width
     definition["dimensions"]["zDimension"] = new_info.hw_height
 
 
+# Cached because CSV rows can reference the same load name more than once,
+# and each lookup is a syscall-heavy directory glob.
+@functools.lru_cache(maxsize=None)
 def find_latest_definition(definition_root_dir: Path, load_name: str) -> Path:
     def sort_key(p: Path) -> tuple[bool, int]:
         # 0 < 1 < 2 < ... < "draft"
@@ -231,20 +332,43 @@ def find_latest_definition(definition_root_dir: Path, load_name: str) -> Path:
     return definition_files[-1]
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """A JSON encoder supporting decimal.Decimal objects.
+def intern_keys(o: object) -> object:
+    """Recursively sys.intern the short dict keys of a parsed JSON tree.
+
+    A definition repeats the same keys ("x", "y", "wells", well names, ...)
+    hundreds of times. Interning them deduplicates the key strings and lets
+    the dict lookups in rewrite_definition hit CPython's pointer-equality
+    fast path.
+    """
+    if isinstance(o, dict):
+        return {
+            (sys.intern(key) if len(key) < 32 else key): intern_keys(value)
+            for key, value in o.items()
+        }
+    if isinstance(o, list):
+        return [intern_keys(value) for value in o]
+    return o
+
+
+def undecimal(o: object) -> object:
+    """Return a copy of a JSON-ish tree with decimal.Decimal values converted.
 
     Decimal(1.0) in Python -> 1 in JSON
     Decimal(1.1) in Python -> 1.1 in JSON
-    """
 
-    def default(self, o: object) -> object:
-        if isinstance(o, Decimal):
-            as_int = int(o)
-            as_float = float(o)
-            is_int = as_int == as_float
-            return as_int if is_int else as_float
-        return super().default(o)
+    Converting the whole tree in one pass up front is cheaper than having the
+    serializer call back into Python once per Decimal it encounters.
+    """
+    if isinstance(o, dict):
+        return {key: undecimal(value) for key, value in o.items()}
+    if isinstance(o, list):
+        return [undecimal(value) for value in o]
+    if isinstance(o, Decimal):
+        as_int = int(o)
+        as_float = float(o)
+        is_int = as_int == as_float
+        return as_int if is_int else as_float
+    return o
 
 
 def indent_exception(formatted_exception_parts: list[str], indentation: int) -> str:
@@ -261,15 +385,12 @@ if __name__ == "__main__":
     definition_root_path = Path(sys.argv[1])
     csv_path = Path(sys.argv[2])
 
-    with open(csv_path) as csv_file:
-        csv_reader = csv.reader(csv_file)
-        csv_rows = list(csv_reader)
-
     successes: list[tuple[int, DefinitionInfo]] = []
+    skipped_unchanged: list[tuple[int, DefinitionInfo]] = []
     failed_extractions: list[tuple[int, pydantic.ValidationError]] = []
     failed_rewrites: list[tuple[int, DefinitionInfo, Exception]] = []
 
-    for row_index, extraction_result in extract_definition_info_from_csv(csv_rows):
+    for row_index, extraction_result in extract_definition_info_from_csv(csv_path):
         if isinstance(extraction_result, pydantic.ValidationError):
             failed_extractions.append((row_index, extraction_result))
             continue
@@ -278,22 +399,24 @@ if __name__ == "__main__":
             definition_path = find_latest_definition(
                 definition_root_path, extraction_result.api_load_name
             )
-            definition = json.loads(definition_path.read_bytes(), parse_float=Decimal)
+            definition = intern_keys(orjson.loads(definition_path.read_bytes()))
+            # Re-dump the untouched parse once, so the unchanged check below
+            # compares like-for-like instead of tripping over formatting
+            # differences in the original file.
+            baseline_bytes = orjson.dumps(definition, option=orjson.OPT_INDENT_2)
             rewrite_definition(definition, extraction_result)
         except Exception as exception:
             failed_rewrites.append((row_index, extraction_result, exception))
             continue
 
-        definition_path.write_text(
-            json.dumps(
-                definition,
-                ensure_ascii=False,
-                indent=2,
-                cls=DecimalEncoder,
-            ),
-            encoding="utf-8",
-        )
-        successes.append((row_index, extraction_result))
+        new_bytes = orjson.dumps(undecimal(definition), option=orjson.OPT_INDENT_2)
+        if new_bytes == baseline_bytes:
+            # The CSV already matches the definition, e.g. on a re-run.
+            # Don't bother rewriting the file.
+            skipped_unchanged.append((row_index, extraction_result))
+        else:
+            definition_path.write_bytes(new_bytes)
+            successes.append((row_index, extraction_result))
 
     print(f"{len(successes)} SUCCESSFUL EXTRACTIONS AND REWRITES")
     for row_index, definition_info in successes:
@@ -301,6 +424,12 @@ if __name__ == "__main__":
 
     print()
 
+    print(f"{len(skipped_unchanged)} ALREADY UP TO DATE")
+    for row_index, definition_info in skipped_unchanged:
+        print(" " * 2 + definition_info.api_load_name)
+
+    print()
+
     print(f"{len(failed_extractions)} FAILED EXTRACTIONS")
     for row_index, exception in failed_extractions:
         print(" " * 2 + f"CSV row {row_index+1}:")
@@ -17,14 +17,15 @@
 
 import csv
 import dataclasses
-import json
+import functools
 import sys
-from typing import Any, Annotated, Iterator, Literal, Sequence, TypeVar
+from typing import Any, Annotated, Iterator, Literal, Sequence
 from decimal import Decimal
 from pathlib import Path
 from traceback import format_exception, format_exception_only
 import itertools
 
+import orjson
 from pydantic import BaseModel, Discriminator, Field, TypeAdapter, ValidationError
 
 from opentrons_shared_data.labware.labware_definition import (
@@ -82,52 +83,92 @@ Section = Annotated[
     RectCrossSection | SphericalSection | CircleCrossSection, Discriminator("type")
 ]
 section_type_adapter = TypeAdapter[Section](Section)
+section_list_type_adapter = TypeAdapter(list[Section])
+
+
+def column(rows: list[list[str]], col_index: int) -> tuple[str, ...]:
+    """Return a single column of a band of rows, padding short rows with ""."""
+    return tuple(row[col_index] if col_index < len(row) else "" for row in rows)
 
 
 def parse(
-    csv_rows: list[list[str]],
+    csv_path: Path,
 ) -> Iterator[tuple[str, list[Section] | ValidationError]]:
-    def get_labware_bands(
-        csv_rows: list[list[str]],
-    ) -> Iterator[tuple[str, list[list[str]]]]:
-        """Iterate over horizontal bands of the CSV that each correspond to a single labware.
+    with open(csv_path) as csv_file:
+        header_index = build_header_index(csv.reader(csv_file))
+    api_load_name_header = find_csv_header(header_index, API_LOAD_NAME_HEADER)
+    cross_section_header = find_csv_header(header_index, CROSS_SECTION_HEADER)
 
-        Returns (load_name, rows).
-        """
-        api_load_name_header = find_csv_header(csv_rows, API_LOAD_NAME_HEADER)
-        labware_start_row_indices = [
-            row_index
-            for (row_index, row) in list(enumerate(csv_rows))[
-                api_load_name_header.row_index + 1 :
-            ]
-            if not (
-                row[api_load_name_header.col_index] == ""
-                or row[api_load_name_header.col_index].isspace()
-            )
+    # Second streaming pass: only the rows below the header row are relevant,
+    # so don't hold the rest of the sheet in memory.
+    with open(csv_path) as csv_file:
+        body_rows = [
+            row
+            for row_index, row in enumerate(csv.reader(csv_file))
+            if row_index > api_load_name_header.row_index
         ]
-        return (
-            (band_rows[0][api_load_name_header.col_index], band_rows)
-            for band_rows in split_at_indices(csv_rows, labware_start_row_indices)[1:]
-        )
 
-    cross_section_header = find_csv_header(csv_rows, CROSS_SECTION_HEADER)
+    def get_labware_bands() -> Iterator[tuple[str, list[list[str]]]]:
+        """Iterate over horizontal bands of the CSV that each correspond to a single labware.
 
-    for load_name, labware_rows in get_labware_bands(csv_rows):
-        labware_columns: list[tuple[str, ...]] = list(zip(*labware_rows))
-        field_names = labware_columns[cross_section_header.col_index]
-        # Start from the column containing field names, then go right until we reach an empty column.
-        columns_to_parse = itertools.takewhile(
-            lambda column: any(column),
-            labware_columns[cross_section_header.col_index + 1 :],
-        )
-        try:
-            parsed_sections = [
-                section_type_adapter.validate_python(dict(zip(field_names, column)))
-                for column in columns_to_parse
-            ]
-            yield load_name, parsed_sections
-        except ValidationError as exception:
-            yield load_name, exception
+        Returns (load_name, rows).
+
+        A band starts wherever the API load name column has a non-blank cell.
+        This accumulates rows in a single pass and emits each band as soon as
+        the next one starts, rather than collecting all start indices and
+        re-slicing the row list.
+        """
+        load_name_col_index = api_load_name_header.col_index
+        current_name: str | None = None
+        current_rows: list[list[str]] = []
+        for row in body_rows:
+            cell = row[load_name_col_index]
+            if cell and not cell.isspace():
+                if current_name is not None:
+                    yield current_name, current_rows
+                # Anything accumulated before the first band is junk above the
+                # first labware. Silently drop it.
+                current_name = cell
+                current_rows = []
+            current_rows.append(row)
+        if current_name is not None:
+            yield current_name, current_rows
+
+    # Gather every labware's section dicts first so they can all go through
+    # pydantic in one batched call, which amortizes its per-call setup cost.
+    all_sections: list[dict[str, str]] = []
+    band_bounds: list[tuple[str, int, int]] = []
+    for load_name, labware_rows in get_labware_bands():
+        field_names = column(labware_rows, cross_section_header.col_index)
+        start = len(all_sections)
+        # Start from the column after the field names, then go right until
+        # we reach an empty column.
+        for col_index in itertools.count(cross_section_header.col_index + 1):
+            section_column = column(labware_rows, col_index)
+            if not any(section_column):
+                break
+            all_sections.append(dict(zip(field_names, section_column)))
+        band_bounds.append((load_name, start, len(all_sections)))
+
+    try:
+        validated_sections = section_list_type_adapter.validate_python(all_sections)
+    except ValidationError:
+        validated_sections = None
+
+    for load_name, start, stop in band_bounds:
+        if validated_sections is not None:
+            yield load_name, validated_sections[start:stop]
+        else:
+            # Something in the batch failed. Re-validate this labware's
+            # sections individually so each failing labware reports its own
+            # error, like the batched call can't.
+            try:
+                yield load_name, [
+                    section_type_adapter.validate_python(section)
+                    for section in all_sections[start:stop]
+                ]
+            except ValidationError as exception:
+                yield load_name, exception
 
 
 def to_geometry_def(sections: list[Section]) -> Iterator[SD_WellSegment]:
@@ -219,19 +260,37 @@ class CSVCoordinate:
     col_index: int
 
 
-def find_csv_header(csv_rows: list[list[str]], header_text: str) -> CSVCoordinate:
-    """Find the location of a header within a CSV file."""
+@functools.lru_cache(maxsize=None)
+def normalize_header(text: str) -> str:
+    return text.lower().replace("\n", " ")
 
-    def normalize_header(text: str) -> str:
-        return text.lower().replace("\n", " ")
 
-    matching_cells = [
-        CSVCoordinate(row_index=row_index, col_index=col_index)
-        for row_index, row in enumerate(csv_rows)
-        for col_index, cell in enumerate(row)
-        if normalize_header(cell) == normalize_header(header_text)
-    ]
+def build_header_index(
+    csv_rows: list[list[str]],
+) -> dict[str, list[CSVCoordinate]]:
+    """Index every cell of the CSV by its normalized text, in a single scan.
+
+    This lets callers look up any number of headers without rescanning the
+    whole sheet once per header.
+    """
+    index: dict[str, list[CSVCoordinate]] = {}
+    for row_index, row in enumerate(csv_rows):
+        for col_index, cell in enumerate(row):
+            if not cell or len(cell) > 64:
+                # Empty or conspicuously long cells can't be headers we care
+                # about. Skip normalizing them.
+                continue
+            index.setdefault(normalize_header(cell), []).append(
+                CSVCoordinate(row_index=row_index, col_index=col_index)
+            )
+    return index
+
 
+def find_csv_header(
+    header_index: dict[str, list[CSVCoordinate]], header_text: str
+) -> CSVCoordinate:
+    """Find the location of a header within a CSV file."""
+    matching_cells = header_index.get(normalize_header(header_text), [])
     if len(matching_cells) != 1:
         raise ValueError(
             f"Expected 1 cell to match {repr(header_text)} but got {len(matching_cells)}."
@@ -239,16 +298,9 @@ def find_csv_header(csv_rows: list[list[str]], header_text: str) -> CSVCoordinat
     return matching_cells[0]
 
 
-T = TypeVar("T")
-
-
-def split_at_indices(source: list[T], indices: list[int]) -> list[list[T]]:
-    return [
-        source[begin:end]
-        for (begin, end) in itertools.pairwise(itertools.chain([0], indices, [None]))
-    ]
-
-
+# Cached because CSV rows can reference the same load name more than once,
+# and each lookup is a syscall-heavy directory glob.
+@functools.lru_cache(maxsize=None)
 def find_latest_definition(definition_root_dir: Path, load_name: str) -> Path:
     def sort_key(p: Path) -> tuple[bool, int]:
         # 0 < 1 < 2 < ... < "draft"
@@ -266,22 +318,6 @@ def find_latest_definition(definition_root_dir: Path, load_name: str) -> Path:
     return definition_files[-1]
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """A JSON encoder supporting decimal.Decimal objects.
-
-    Decimal(1.0) in Python -> 1 in JSON
-    Decimal(1.1) in Python -> 1.1 in JSON
-    """
-
-    def default(self, o: object) -> object:
-        if isinstance(o, Decimal):
-            as_int = int(o)
-            as_float = float(o)
-            is_int = as_int == as_float
-            return as_int if is_int else as_float
-        return super().default(o)
-
-
 def indent_exception(formatted_exception_parts: list[str], indentation: int) -> str:
     """Indent the output of traceback.format_exception() and related functions.
 
@@ -296,22 +332,18 @@ if __name__ == "__main__":
     definition_root_path = Path(sys.argv[1])
     csv_path = Path(sys.argv[2])
 
-    with open(csv_path) as csv_file:
-        csv_reader = csv.reader(csv_file)
-        csv_rows = list(csv_reader)
-
     successes: list[str] = []
     parse_failures: list[Exception] = []
     rewrite_failures: list[tuple[str, Exception]] = []
 
-    for load_name, sections in parse(csv_rows):
+    for load_name, sections in parse(csv_path):
         if isinstance(sections, Exception):
             parse_failures.append(sections)
             continue
 
         try:
             definition_path = find_latest_definition(definition_root_path, load_name)
-            definition = json.loads(definition_path.read_bytes(), parse_float=Decimal)
+            definition = orjson.loads(definition_path.read_bytes())
             new_sections = list(
                 reversed(
                     [
@@ -322,14 +354,8 @@ if __name__ == "__main__":
             )
             for key in definition["innerLabwareGeometry"]:
                 definition["innerLabwareGeometry"][key] = {"sections": new_sections}
-            definition_path.write_text(
-                json.dumps(
-                    definition,
-                    ensure_ascii=False,
-                    indent=2,
-                    cls=DecimalEncoder,
-                ),
-                encoding="utf-8",
+            definition_path.write_bytes(
+                orjson.dumps(definition, option=orjson.OPT_INDENT_2)
             )
         except Exception as exception:
             rewrite_failures.append((load_name, exception))
@@ -1,11 +1,22 @@
 """Consult --help for usage instructions."""
 
 import argparse
+import concurrent.futures
+import functools
+import hashlib
+import os
 import pathlib
+import re
 import shutil
 import sys
 import typing
-import json
+
+import orjson
+
+
+# Matches the "version" key in a definition's raw bytes so the common
+# already-correct case can be detected without parsing the whole file.
+VERSION_RE = re.compile(rb'"version"\s*:\s*(\d+)')
 
 
 def main() -> int:
@@ -116,9 +127,24 @@ def main() -> int:
                 existing_file = None
                 existing_highest_version = None
 
-            if existing_file is None or json.loads(
-                draft_path.read_bytes()
-            ) != json.loads(existing_file.read_bytes()):
+            if existing_file is None:
+                draft_differs = True
+            else:
+                draft_bytes = draft_path.read_bytes()
+                existing_bytes = existing_file.read_bytes()
+                # Identical drafts (the common case) are detected by raw byte
+                # equality. Formatting-level differences fall back to a
+                # canonical-hash compare, whose existing-file side is cached
+                # across drafts.
+                draft_differs = (
+                    draft_bytes != existing_bytes
+                    and canonical_hash_of_bytes(draft_bytes)
+                    != canonical_hash(
+                        str(existing_file), existing_file.stat().st_mtime_ns
+                    )
+                )
+
+            if draft_differs:
                 if existing_highest_version is None:
                     new_version = 1
                 elif drafts_to_new_versions:
@@ -132,23 +158,91 @@ def main() -> int:
                 draft_path.unlink()
 
     if versions_from_filenames:
-        for _, path, version in all_numbered_versions:
-            json_contents = json.loads(path.read_bytes())
-            if json_contents["version"] != version:
-                json_contents["version"] = version
-                path.write_text(json.dumps(json_contents, indent=2, ensure_ascii=False))
+        # Each file is checked and rewritten independently, so fan the work
+        # out across cores.
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            for _ in executor.map(
+                set_version_from_filename,
+                [(path, version) for _, path, version in all_numbered_versions],
+                chunksize=32,
+            ):
+                pass
+
+
+def canonical_hash_of_bytes(data: bytes) -> bytes:
+    """Hash a JSON document's semantic content.
+
+    Two documents that differ only in formatting or key order hash the same,
+    so comparing hashes answers "are these the same definition?" without
+    comparing (or even keeping) the parsed trees.
+    """
+    return hashlib.blake2b(
+        orjson.dumps(orjson.loads(data), option=orjson.OPT_SORT_KEYS),
+        digest_size=16,
+    ).digest()
+
+
+@functools.lru_cache(maxsize=None)
+def canonical_hash(path_str: str, mtime_ns: int) -> bytes:
+    """Like canonical_hash_of_bytes, for a file, memoized on (path, mtime).
+
+    Several drafts can share the same existing highest version, so keying the
+    cache on the file's mtime lets repeat lookups skip the re-read and
+    re-hash while still noticing files modified mid-run.
+    """
+    return canonical_hash_of_bytes(pathlib.Path(path_str).read_bytes())
+
+
+def set_version_from_filename(
+    path_and_version: tuple[pathlib.Path, int],
+) -> None:
+    """Make one labware definition's internal version match its filename.
+
+    Runs in a worker process.
+    """
+    path, version = path_and_version
+    data = path.read_bytes()
+    version_match = VERSION_RE.search(data)
+    if version_match is not None and int(version_match.group(1)) == version:
+        # The version already matches the filename. Skip the parse+dump.
+        return
+    json_contents = orjson.loads(data)
+    if json_contents["version"] != version:
+        json_contents["version"] = version
+        # orjson emits UTF-8 bytes directly, so this is a single buffer write
+        # with no intermediate str and no re-encode.
+        path.write_bytes(orjson.dumps(json_contents, option=orjson.OPT_INDENT_2))
 
 
 def resolve_paths(
     roots: typing.Iterable[pathlib.Path],
 ) -> typing.Iterable[pathlib.Path]:
     for root in roots:
+        # Resolve once per root, not once per file: parse_path() reads each
+        # file's parent directory name lexically, which only works if bare
+        # relative arguments like `1.json` are anchored here first.
+        root = root.resolve()
         if root.is_dir():
-            yield from root.glob("**/*.json")
+            yield from _walk(str(root))
         else:
             yield root
 
 
+def _walk(root: str) -> typing.Iterable[pathlib.Path]:
+    """Recursively yield every .json file under root.
+
+    Equivalent to Path.glob("**/*.json"), but walks with os.scandir so each
+    entry's name and type come from the cached DirEntry, and a Path object is
+    only built for the .json files actually yielded.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.name.endswith(".json"):
+                yield pathlib.Path(entry.path)
+
+
 def parse_path(path: pathlib.Path) -> tuple[str, int | typing.Literal["draft"]] | None:
     """Infer a labware definition's load name and version from its path."""
     if path.suffix != ".json":
@@ -162,7 +256,9 @@ def parse_path(path: pathlib.Path) -> tuple[str, int | typing.Literal["draft"]]
         except ValueError:
             return None
 
-    name = path.resolve().parent.name
+    # The roots were resolved in resolve_paths(), so the parent name is
+    # available lexically without a stat/readlink per file here.
+    name = path.parent.name
     return name, version
 
 
@@ -5,26 +5,18 @@
 # make -C .. format-js
 
 
-import json
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
 from pathlib import Path
 import sys
 from traceback import format_exception
-import decimal
 
 from opentrons_shared_data.labware.types import LabwareDefinition as LabwareDefinitionV2
 
+from _migrate_utils import dump_def_if_changed, fsync_parent_dirs, load_def_with_bytes
 
-PROBLEM_INDENT = " " * 2
-
-
-class DecimalEncoder(json.JSONEncoder):
-    """A JSON encoder that can encode decimal.Decimal objects."""
 
-    def default(self, o: object) -> object:
-        if isinstance(o, decimal.Decimal):
-            return float(o)
-        else:
-            return super().default(o)
+PROBLEM_INDENT = " " * 2
 
 
 class WarningAccumulator:
@@ -50,7 +42,11 @@ def remove_corner_offset_from_slot(
     definition: LabwareDefinitionV2, warning_accumulator: WarningAccumulator
 ) -> None:
     corner_offset_from_slot = definition["cornerOffsetFromSlot"]
-    if corner_offset_from_slot == {"x": 0, "y": 0, "z": 0}:
+    if (
+        corner_offset_from_slot["x"] == 0
+        and corner_offset_from_slot["y"] == 0
+        and corner_offset_from_slot["z"] == 0
+    ):
         del definition["cornerOffsetFromSlot"]  # type: ignore
     else:
         warning_accumulator.warn(
@@ -62,14 +58,19 @@ def remove_corner_offset_from_slot(
 def move_wells_to_quadrant_4(
     definition: LabwareDefinitionV2, warning_accumulator: WarningAccumulator
 ) -> None:
-    back_row_wells = [column[0] for column in definition["ordering"]]
-    front_row_wells = [column[-1] for column in definition["ordering"]]
+    wells = definition["wells"]
+    # The centered-ness check below needs exact decimal arithmetic: insets
+    # like 85.48 - 74.24 and 11.24 are equal in decimal but differ by ~9e-15
+    # in binary float, which would spuriously fail the check. orjson has no
+    # parse_float hook, so rebuild the exact decimal values from each float's
+    # shortest repr, which is the number as written in the JSON.
+    y_dimension = Decimal(str(definition["dimensions"]["yDimension"]))
     back_row_inset_distances = [
-        definition["dimensions"]["yDimension"] - definition["wells"][well]["y"]
-        for well in back_row_wells
+        y_dimension - Decimal(str(wells[column[0]]["y"]))
+        for column in definition["ordering"]
     ]
     front_row_inset_distances = [
-        definition["wells"][well]["y"] for well in front_row_wells
+        Decimal(str(wells[column[-1]]["y"])) for column in definition["ordering"]
     ]
 
     # The distance between wells is generally obvious, standard, and trustworthy.
@@ -87,8 +88,11 @@ def move_wells_to_quadrant_4(
     ]
     all_columns_centered = all(difference == 0 for difference in differences)
     if all_columns_centered:
-        for well in definition["wells"].values():
-            well["y"] = -(definition["dimensions"]["yDimension"] - well["y"])
+        # The shift is done in Decimal too; dump_def_if_changed's
+        # default=float folds the exact results back to clean floats on
+        # output.
+        for well in wells.values():
+            well["y"] = -(y_dimension - Decimal(str(well["y"])))
     else:
         warning_accumulator.warn(
             f"Wells are not centered in the y-direction within the labware bounding box."
@@ -97,41 +101,52 @@ def move_wells_to_quadrant_4(
         )
 
 
+def process_file(path: Path) -> tuple[Path, list[str], list[str] | None]:
+    """Migrate one definition file in place.
+
+    Runs in a worker process. Returns (path, warning messages, error), where
+    error is the formatted exception if the migration raised, in which case
+    the file was not modified.
+    """
+    definition, raw = load_def_with_bytes(path)
+    try:
+        accumulated_warnings = migrate(definition)
+    except Exception as e:
+        return path, [], format_exception(e)
+    dump_def_if_changed(path, definition, raw)
+    return path, accumulated_warnings.messages, None
+
+
 if __name__ == "__main__":
     paths = [Path(arg) for arg in sys.argv[1:]]
     problematic_file_count = 0
 
-    for path in paths:
-        definition: LabwareDefinitionV2 = json.loads(
-            path.read_text(encoding="utf-8"),
-            parse_float=decimal.Decimal,
-        )
-        try:
-            accumulated_warnings = migrate(definition)
-        except Exception as e:
-            print(f"Internal error migrating {path}. It has not been modified.")
-            exception_strings = format_exception(e)
-            for s in exception_strings:
-                print(PROBLEM_INDENT + s, end="")
-            problematic_file_count += 1
-        else:
-            path.write_text(
-                json.dumps(
-                    definition,
-                    indent=2,
-                    ensure_ascii=False,
-                    cls=DecimalEncoder,
-                ),
-                encoding="utf-8",
-            )
-            if accumulated_warnings.messages:
-                print(
-                    f"Problems while migrating {path}. It has been partially migrated."
+    # Each file is migrated independently, so fan the work out across cores.
+    log_lines = []
+    with ProcessPoolExecutor() as executor:
+        for path, warning_messages, error in executor.map(
+            process_file, paths, chunksize=32
+        ):
+            if error is not None:
+                log_lines.append(
+                    f"Internal error migrating {path}. It has not been modified.\n"
+                )
+                # The formatted exception lines are already newline-terminated.
+                log_lines.extend(PROBLEM_INDENT + s for s in error)
+                problematic_file_count += 1
+            elif warning_messages:
+                log_lines.append(
+                    f"Problems while migrating {path}. It has been partially migrated.\n"
+                )
+                log_lines.extend(
+                    PROBLEM_INDENT + message + "\n" for message in warning_messages
                 )
-                for message in accumulated_warnings.messages:
-                    print(PROBLEM_INDENT + message)
                 problematic_file_count += 1
 
+    fsync_parent_dirs(paths)
+
+    # One buffered write instead of a flushing print per problematic file.
+    sys.stdout.write("".join(log_lines))
     print(
         f"Processed {len(paths)} files, {problematic_file_count} of which need attention."
     )
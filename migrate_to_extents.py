@@ -5,56 +5,75 @@
 # make -C .. format-js
 
 
-from copy import deepcopy
-import json
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
 from pathlib import Path
 import sys
-import decimal
 
-class DecimalEncoder(json.JSONEncoder):
-    """A JSON encoder that can encode decimal.Decimal objects."""
+import orjson
 
-    def default(self, o: object) -> object:
-        if isinstance(o, decimal.Decimal):
-            return float(o)
-        else:
-            return super().default(o)
+from _migrate_utils import dump_def_if_changed, fsync_parent_dirs
 
 
-def migrate(context: str, definition: dict) -> dict:
-    if "extents" in definition:
-        print(f"{context}: already migrated, ignoring")
-        return definition
+def migrate(context: str, definition: dict) -> tuple[dict, list[str]]:
+    """Migrate one parsed definition. Returns (definition, log lines)."""
+    log = []
 
-    if definition["cornerOffsetFromSlot"] != {"x": 0, "y": 0, "z": 0}:
-        print(
-            f"{context}: cornerOffsetFromSlot is nonzero."
-            " New extents will take this into account, but other vectors,"
-            " like well coordinates and stacking offsets, will not,"
-            " and will need manual review."
-        )
+    if "extents" in definition:
+        log.append(f"{context}: already migrated, ignoring")
+        return definition, log
 
     cofs = definition["cornerOffsetFromSlot"]
     x_dimension = definition["dimensions"]["xDimension"]
     y_dimension = definition["dimensions"]["yDimension"]
     z_dimension = definition["dimensions"]["zDimension"]
 
-    cofs_y_inverse = -cofs["y"]
     y_inverse = -y_dimension
 
-    x0 = cofs["x"]
-    x1 = cofs["x"] + x_dimension
-    y0 = cofs_y_inverse
-    y1 = cofs_y_inverse + y_inverse
-    z0 = cofs["z"]
-    z1 = cofs["z"] + z_dimension
-
-    new_extents = {
-        "total": {
-            "backLeftBottom": {"x": x0, "y": y0, "z": z0},
-            "frontRightTop": {"x": x1, "y": y1, "z": z1},
-        },
-    }
+    if cofs["x"] == 0 and cofs["y"] == 0 and cofs["z"] == 0:
+        # The common case: with a zero offset, the extents are just the
+        # dimensions, so skip the offset arithmetic entirely.
+        new_extents = {
+            "total": {
+                "backLeftBottom": {"x": 0, "y": 0, "z": 0},
+                "frontRightTop": {
+                    "x": x_dimension,
+                    "y": y_inverse,
+                    "z": z_dimension,
+                },
+            },
+        }
+    else:
+        log.append(
+            f"{context}: cornerOffsetFromSlot is nonzero."
+            " New extents will take this into account, but other vectors,"
+            " like well coordinates and stacking offsets, will not,"
+            " and will need manual review."
+        )
+
+        # Offsetting in binary float leaves noise (e.g. ~9e-15) in values
+        # that are exact in decimal, and these extents are committed
+        # verbatim to the definitions repo. orjson has no parse_float hook,
+        # so rebuild the exact decimal values from each float's shortest
+        # repr; dump_def_if_changed's default=float folds the results back
+        # to clean floats on output.
+        cofs_x = Decimal(str(cofs["x"]))
+        cofs_y_inverse = -Decimal(str(cofs["y"]))
+        cofs_z = Decimal(str(cofs["z"]))
+
+        x0 = cofs_x
+        x1 = cofs_x + Decimal(str(x_dimension))
+        y0 = cofs_y_inverse
+        y1 = cofs_y_inverse - Decimal(str(y_dimension))
+        z0 = cofs_z
+        z1 = cofs_z + Decimal(str(z_dimension))
+
+        new_extents = {
+            "total": {
+                "backLeftBottom": {"x": x0, "y": y0, "z": z0},
+                "frontRightTop": {"x": x1, "y": y1, "z": z1},
+            },
+        }
 
     features = {
         "slotFootprintAsChild": {
@@ -64,48 +83,64 @@ def migrate(context: str, definition: dict) -> dict:
         },
     }
 
-    new_wells = {}
-    for well_name, well_data in definition["wells"].items():
-        new_well = deepcopy(well_data)
-        new_well["y"] = -(y_dimension - well_data["y"])
-        new_wells[well_name] = new_well
-
-    definition["wells"] = new_wells
+    # The parsed definition is ours to mutate, so update each well in place.
+    # The shift happens in Decimal: 85.48 - 74.24 leaves ~9e-15 of noise in
+    # binary float, and these coordinates are committed verbatim to the
+    # definitions repo.
+    y_dimension_exact = Decimal(str(y_dimension))
+    for well_data in definition["wells"].values():
+        well_data["y"] = -(y_dimension_exact - Decimal(str(well_data["y"])))
 
     # Delete cornerOffsetFromSlot and replace dimensions with extents,
     # then add features right after extents.
-    # Do it in this way to preserve ordering and minimize the diff.
-    new_definition = {}
-    for original_key, original_value in definition.items():
-        if original_key == "cornerOffsetFromSlot":
-            continue
-        elif original_key == "dimensions":
-            new_definition["extents"] = new_extents
-            new_definition["features"] = features
-        else:
-            new_definition[original_key] = original_value
-
-    print(f"{context}: migrated")
-    return new_definition
+    # Splice positionally to preserve ordering and minimize the diff.
+    items = [
+        (key, value)
+        for key, value in definition.items()
+        if key != "cornerOffsetFromSlot"
+    ]
+    dimensions_index = next(
+        index for index, (key, _) in enumerate(items) if key == "dimensions"
+    )
+    items[dimensions_index] = ("extents", new_extents)
+    items.insert(dimensions_index + 1, ("features", features))
+    new_definition = dict(items)
+
+    log.append(f"{context}: migrated")
+    return new_definition, log
+
+
+def process_file(path: Path) -> list[str]:
+    """Migrate one definition file in a single read-transform-write pass.
+
+    Runs in a worker process. Returns the log lines for this file, which the
+    parent prints in one batch at the end.
+    """
+    raw = path.read_bytes()
+    if b'"extents":' in raw:
+        # Byte-level fast path: an already-migrated definition has an
+        # "extents" key, and skipping it here avoids parsing and re-encoding
+        # the whole tree just to write it back unchanged. (migrate() still
+        # re-checks on the parsed dict, so a false positive from, say, a
+        # string value can't corrupt anything -- it would only skip a file
+        # that a human should look at anyway.)
+        return [f"{path}: already migrated, ignoring"]
+    migrated_definition, log = migrate(str(path), orjson.loads(raw))
+    dump_def_if_changed(path, migrated_definition, raw)
+    return log
 
 
 if __name__ == "__main__":
     paths = [Path(arg) for arg in sys.argv[1:]]
 
-    for path in paths:
-        definition = json.loads(
-            path.read_text(encoding="utf-8"),
-            parse_float=decimal.Decimal,
-        )
-        migrated_definition = migrate(str(path), definition)
-        path.write_text(
-            json.dumps(
-                migrated_definition,
-                indent=2,
-                ensure_ascii=False,
-                cls=DecimalEncoder,
-            ),
-            encoding="utf-8",
-        )
+    # Each file is migrated independently, so fan the work out across cores.
+    log_lines = []
+    with ProcessPoolExecutor() as executor:
+        for file_log in executor.map(process_file, paths, chunksize=32):
+            log_lines.extend(file_log)
+
+    fsync_parent_dirs(paths)
 
+    # One buffered write instead of a flushing print per file.
+    sys.stdout.write("".join(line + "\n" for line in log_lines))
     print(f"Processed {len(paths)} files.")
\ No newline at end of file
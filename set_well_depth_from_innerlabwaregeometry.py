@@ -5,62 +5,51 @@
 # make -C .. format-js
 
 
-from copy import deepcopy
-import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 from traceback import format_exception
-import decimal
 
 from opentrons_shared_data.labware.types import LabwareDefinition2
 
-
-PROBLEM_INDENT = " " * 2
+from _migrate_utils import dump_def_if_changed, fsync_parent_dirs, load_def_with_bytes
 
 
-class DecimalEncoder(json.JSONEncoder):
-    """A JSON encoder that can encode decimal.Decimal objects."""
-
-    def default(self, o: object) -> object:
-        if isinstance(o, decimal.Decimal):
-            return float(o)
-        else:
-            return super().default(o)
+PROBLEM_INDENT = " " * 2
 
 
 def process(definition: LabwareDefinition2) -> LabwareDefinition2:
-    result = deepcopy(definition)
-    inner_labware_geometry = result.get("innerLabwareGeometry", {})
+    # Mutates in place. The caller discards its parsed input afterwards, so
+    # there's no need to deepcopy the whole definition first.
+    inner_labware_geometry = definition.get("innerLabwareGeometry", {})
 
     if len(inner_labware_geometry) != 1:
-        return result
+        return definition
 
     [geometries] = inner_labware_geometry.values()
     top_section_height = geometries["sections"][0]["topHeight"]
 
-    for well in result["wells"].values():
+    for well in definition["wells"].values():
         well["depth"] = top_section_height
 
-    return result
+    return definition
+
+
+def process_file(path: Path) -> None:
+    """Update one definition file in place. Runs in a worker process."""
+    input, raw = load_def_with_bytes(path)
+    output = process(input)
+    dump_def_if_changed(path, output, raw)
 
 
 if __name__ == "__main__":
     paths = [Path(arg) for arg in sys.argv[1:]]
 
-    for path in paths:
-        input: LabwareDefinition2 = json.loads(
-            path.read_text(encoding="utf-8"),
-            parse_float=decimal.Decimal,
-        )
-        output = process(input)
-        path.write_text(
-            json.dumps(
-                output,
-                indent=2,
-                ensure_ascii=False,
-                cls=DecimalEncoder,
-            ),
-            encoding="utf-8",
-        )
+    # Each file is processed independently, so fan the work out across cores.
+    with ProcessPoolExecutor() as executor:
+        for _ in executor.map(process_file, paths, chunksize=32):
+            pass
+
+    fsync_parent_dirs(paths)
 
     print(f"Processed {len(paths)} paths")